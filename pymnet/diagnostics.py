@@ -25,9 +25,11 @@ def degs(net,degstype="distribution"):
         the_iterator=net.iter_node_layers()
     degs={}
     if degstype=="distribution":
-        for node in the_iterator:
-            d=net[node].deg()
-            degs[d]=degs.get(d,0)+1
+        import numpy
+        degarray=numpy.fromiter((net[node].deg() for node in the_iterator),dtype=numpy.int64)
+        counts=numpy.bincount(degarray)
+        nonzero=numpy.flatnonzero(counts)
+        degs=dict(zip(nonzero.tolist(),counts[nonzero].tolist()))
     elif degstype=="nodes":
         for node in the_iterator:
             degs[node]=net[node].deg()
@@ -82,11 +84,7 @@ def multiplex_degs(net,degstype="distribution"):
 
     """
     assert isinstance(net,MultiplexNetwork)
-    
-    d={}
-    for layer in net.iter_layers():
-        d[layer]=degs(net.A[layer],degstype=degstype)
-    return d
+    return dict((layer,degs(net.A[layer],degstype=degstype)) for layer in net.iter_layers())
 
 def overlap_degs(net):
     """ Returns a dictionary of overlap degree distributions of each layer combination
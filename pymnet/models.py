@@ -9,7 +9,205 @@ except NameError:
 ######
 
 from .net import MultilayerNetwork,MultiplexNetwork
-import math,random
+import math,random,itertools
+
+
+def _numpy_rng():
+    """Returns a NumPy random generator seeded from the random module.
+
+    Seeding from the random module keeps the results reproducible with
+    random.seed. Returns None if NumPy is older than 1.17 and has no
+    default_rng, in which case the callers draw from the random module.
+    """
+    import numpy
+    try:
+        return numpy.random.default_rng(random.getrandbits(64))
+    except AttributeError:
+        return None
+
+def _geometric_skip_indices(rng,nindices,p,maxbatch=2**20):
+    """Iterates over arrays of indices in range(nindices), each of which is
+    selected independently with probability 0<p<1.
+
+    The gaps between consecutive selected indices are geometrically distributed.
+    They are drawn in batches and summed cumulatively, which is the vectorized
+    equivalent of the skipping loop of Batagelj and Brandes.
+    """
+    batch=int(min(max(1.1*p*nindices,16),maxbatch))
+    last=-1
+    while True:
+        indices=last+rng.geometric(p,size=batch).cumsum()
+        if indices[-1]>=nindices:
+            yield indices[:indices.searchsorted(nindices)]
+            return
+        yield indices
+        last=indices[-1]
+
+def _bernoulli_indices(rng,nindices,p,maxbatch=2**22):
+    """Iterates over arrays of indices in range(nindices), each of which is
+    selected independently with probability p.
+
+    The indices are selected with Bernoulli masks over consecutive batches of
+    the index range. This is faster than geometric skips for dense selections.
+    """
+    import numpy
+    for start in range(0,nindices,maxbatch):
+        yield start+numpy.flatnonzero(rng.random(min(maxbatch,nindices-start))<p)
+
+def _random_indices(rng,nindices,p):
+    """Iterates over arrays of indices in range(nindices), each of which is
+    selected independently with probability 0<p<=1.
+
+    Geometric skips are used for sparse selections and Bernoulli masks for
+    dense ones, whichever generates the indices faster.
+    """
+    if p<0.25:
+        return _geometric_skip_indices(rng,nindices,p)
+    else:
+        return _bernoulli_indices(rng,nindices,p)
+
+def _triangle_index_to_pair(indices):
+    """Maps linear indices of the lower triangle of a matrix to pairs (v,w) with w<v.
+
+    The index of the pair (v,w) is v*(v-1)/2+w. The floating point estimate of v
+    is corrected so that the result is exact also for very large indices.
+    """
+    import numpy
+    v=((1+numpy.sqrt(1+8*indices.astype(numpy.float64)))//2).astype(numpy.int64)
+    v-=(v*(v-1))//2>indices
+    v+=(v*(v+1))//2<=indices
+    w=indices-(v*(v-1))//2
+    return v,w
+
+
+def _two_distinct(m):
+    """Returns two distinct random integers from range(m).
+
+    Raises ValueError if m<2, like random.sample would.
+    """
+    if m<2:
+        raise ValueError("Cannot select two distinct integers from range("+str(m)+").")
+    a=random.randrange(m)
+    b=random.randrange(m)
+    while b==a:
+        b=random.randrange(m)
+    return a,b
+
+def _ordered_pair(a,b):
+    """Returns the two elements as a tuple in sorted order.
+    """
+    return (b,a) if b<a else (a,b)
+
+def _pair_key(a,b):
+    """Packs an unordered pair of node indices smaller than 2**32 to a single integer.
+
+    The smaller index is in the high bits: a key is decoded as key>>32, key&0xffffffff.
+    """
+    return (a<<32)|b if a<=b else (b<<32)|a
+
+def _conf_pair_stubs(stubs):
+    """Pairs consecutive stubs to edges of a configuration model.
+
+    The stubs are a sequence or array of integer node indices. The edges are
+    identified by their keys given by _pair_key. Returns the set of distinct
+    non-self edges, a dict mapping nodes to the stub positions of their
+    self-edges, the set of edges appearing more than once, and a dict mapping
+    each of those edges to its stub positions.
+    """
+    import numpy
+
+    #Edge keys, one for each pair of consecutive stubs
+    pairs=numpy.sort(numpy.asarray(stubs,dtype=numpy.int64).reshape(-1,2),axis=1)
+    keys=(pairs[:,0]<<32)|pairs[:,1]
+    uniquekeys,inverse,counts=numpy.unique(keys,return_inverse=True,return_counts=True)
+    isself=(uniquekeys>>32)==(uniquekeys&0xffffffff)
+    ismulti=(counts>1)&~isself
+
+    edges=set(uniquekeys[~isself].tolist())
+    multiedges=set(uniquekeys[ismulti].tolist())
+    selfedges={}
+    selfpositions=numpy.flatnonzero(isself[inverse])
+    for s,node in zip(selfpositions.tolist(),pairs[selfpositions,0].tolist()):
+        selfedges.setdefault(node,[]).append(2*s)
+    edgetoindex={}
+    multipositions=numpy.flatnonzero(ismulti[inverse])
+    for s,key in zip(multipositions.tolist(),keys[multipositions].tolist()):
+        edgetoindex.setdefault(key,[]).append(2*s)
+    return edges,selfedges,multiedges,edgetoindex
+
+def _conf_rewire(stubs,edges,selfedges,multiedges,edgetoindex):
+    """Removes the self-edges and multi-edges of a configuration model by rewiring.
+
+    The edges are formed by pairing consecutive elements of the stubs list, which
+    contains integer node indices. The set edges contains the key of each distinct
+    non-self edge, selfedges maps nodes to the stub positions of their self-edges,
+    multiedges is the set of keys of edges that appear more than once, and
+    edgetoindex maps those keys to the stub positions of the edges. The edge keys
+    are given by _pair_key. The stubs and edges are modified in place.
+
+    See single_layer_conf for the description of the algorithm.
+    """
+    for node,sis in selfedges.items():
+        for si in sis:
+            repeat=True
+            while repeat:
+                #select two edges at random
+                i1,i2=_two_distinct(len(stubs)//2)
+                e1i,e2i=2*i1,2*i2
+                c=[node,stubs[e1i],stubs[e1i+1],stubs[e2i],stubs[e2i+1]]
+                n2,n3=_ordered_pair(c[1],c[2])
+                n4,n5=_ordered_pair(c[3],c[4])
+                if len(set(c))==len(c):
+                    k23,k45=(n2<<32)|n3,(n4<<32)|n5
+                    if k23 not in multiedges and k45 not in multiedges:
+                        e1=_pair_key(node,n2)
+                        e2=_pair_key(node,n4)
+                        e3=_pair_key(n3,n5)
+                        if e1 not in edges and e2 not in edges and e3 not in edges:
+                            edges.remove(k23)
+                            edges.remove(k45)
+                            edges.add(e1)
+                            edges.add(e2)
+                            edges.add(e3)
+                            stubs[si],stubs[si+1]=n3,n5
+                            stubs[e1i],stubs[e1i+1]=node,n2
+                            stubs[e2i],stubs[e2i+1]=node,n4
+                            repeat=False
+
+    for key in multiedges:
+        n1,n2=key>>32,key&0xffffffff
+        sis=edgetoindex[key]
+        for dummy in range(len(sis)//2):
+            repeat=True
+            while repeat:
+                #select two edges at random
+                i1,i2=_two_distinct(len(stubs)//2)
+                e1i,e2i=2*i1,2*i2
+                c=[n1,n2,stubs[e1i],stubs[e1i+1],stubs[e2i],stubs[e2i+1]]
+                n3,n4=_ordered_pair(c[2],c[3])
+                n5,n6=_ordered_pair(c[4],c[5])
+                if len(set(c))==len(c):
+                    k34,k56=(n3<<32)|n4,(n5<<32)|n6
+                    if k34 not in multiedges and k56 not in multiedges:
+                        e1=_pair_key(n1,n3)
+                        e2=_pair_key(n2,n4)
+                        e3=_pair_key(n1,n5)
+                        e4=_pair_key(n2,n6)
+                        if e1 not in edges and e2 not in edges and e3 not in edges and e4 not in edges:
+                            if len(sis)==2:
+                                edges.remove(key)
+                            edges.remove(k34)
+                            edges.remove(k56)
+                            edges.add(e1)
+                            edges.add(e2)
+                            edges.add(e3)
+                            edges.add(e4)
+                            si1,si2=_ordered_pair(sis.pop(),sis.pop())
+                            stubs[si1],stubs[si1+1]=n1,n3
+                            stubs[si2],stubs[si2+1]=n2,n4
+                            stubs[e1i],stubs[e1i+1]=n1,n5
+                            stubs[e2i],stubs[e2i+1]=n2,n6
+                            repeat=False
 
 
 def single_layer_conf(net,degs,degstype="distribution"):
@@ -38,37 +236,22 @@ def single_layer_conf(net,degs,degstype="distribution"):
     sampled networks are not exactly statistically uniform. However, if the degrees 
     are small compared to the number of nodes the error is likely to be small.
     """
-    stubs=[]
-    selfedges={}
-    multiedges=set()
-    edgetoindex={}
+    import numpy
 
+    #The nodes are integer indices, labels maps them to node names and nodedegs to degrees
     if degstype=="distribution":
-        nstubs=sum(map(lambda x:x[0]*x[1],degs.items()))
-        nodes=sum(degs.values())
-        shuffled_node_indices=list(range(nodes))
-        random.shuffle(shuffled_node_indices)
-        node=0
-        for k,num in degs.items():
-            if k==0:
-                for i in range(num):
-                    net.add_node(shuffled_node_indices[node])
-                    node+=1
-            else:
-                for i in range(num):
-                    for j in range(k):
-                        stubs.append(shuffled_node_indices[node])
-                    node+=1
+        ks=numpy.fromiter(degs.keys(),dtype=numpy.int64,count=len(degs))
+        nums=numpy.fromiter(degs.values(),dtype=numpy.int64,count=len(degs))
+        nstubs=int((ks*nums).sum())
+        nodes=int(nums.sum())
+        nodedegs=numpy.repeat(ks,nums)
+        labels=list(range(nodes))
+        random.shuffle(labels)
     elif degstype=="nodes":
-        nstubs=sum(degs.values())
         nodes=len(degs)
-        #for node,k in degs.iteritems():
-        for node in degs:
-            k=degs[node]
-            for i in range(k):
-                stubs.append(node)
-            if k==0:
-                net.add_node(node)
+        labels=list(degs)
+        nodedegs=numpy.fromiter((degs[label] for label in labels),dtype=numpy.int64,count=nodes)
+        nstubs=int(nodedegs.sum())
     else:
         raise Exception("Invalid degstype: '"+str(degstype)+"'")
     
@@ -76,80 +259,26 @@ def single_layer_conf(net,degs,degstype="distribution"):
     assert nstubs%2==0
     assert (nodes*(nodes-1)) >= nstubs
 
-    random.shuffle(stubs)
+    for node in numpy.flatnonzero(nodedegs==0).tolist():
+        net.add_node(labels[node])
 
-    for s in range(int(len(stubs)/2)):
-        node1,node2=sorted([stubs[2*s],stubs[2*s+1]])
-
-        edgetoindex[(node1,node2)]=edgetoindex.get((node1,node2),[])+[2*s]
-
-        if net[node1,node2]!=0:
-            multiedges.add((node1,node2))
+    #Each node appears in the stubs as many times as its degree
+    stubs=numpy.repeat(numpy.arange(nodes,dtype=numpy.int64),nodedegs)
+    rng=_numpy_rng()
+    if rng!=None:
+        rng.shuffle(stubs)
+    else:
+        random.shuffle(stubs)
 
-        if node1==node2:
-            selfedges[node1]=selfedges.get(node1,[])+[2*s]
-        else:
-            net[node1,node2]=1
-
-    for node,sis in selfedges.items():
-        for si in sis:
-            repeat=True
-            while repeat:
-                #select two edges at random
-                e1i,e2i=map(lambda x:2*x,random.sample(xrange(int(len(stubs)/2)),2))
-                c=[node,stubs[e1i],stubs[e1i+1],stubs[e2i],stubs[e2i+1]]
-                n2,n3=sorted([c[1],c[2]])
-                n4,n5=sorted([c[3],c[4]])
-                if len(set(c))==len(c):
-                    if (n2,n3) not in multiedges and (n4,n5) not in multiedges:
-                        if net[node,n2]==0 and net[node,n4]==0 and net[n3,n5]==0:                            
-                            net[n2,n3]=0
-                            net[n4,n5]=0
-                            net[node,n2]=1
-                            net[node,n4]=1
-                            net[n3,n5]=1
-                            stubs[si],stubs[si+1]=sorted([n3,n5])
-                            stubs[e1i],stubs[e1i+1]=sorted([node,n2])
-                            stubs[e2i],stubs[e2i+1]=sorted([node,n4])
-                            repeat=False
+    edges,selfedges,multiedges,edgetoindex=_conf_pair_stubs(stubs)
+    stubs=stubs.tolist()
+    _conf_rewire(stubs,edges,selfedges,multiedges,edgetoindex)
 
     # Uncomment to check that everything ok so far:
-    #import diagnostics
-    #assert sum(map(lambda x:x[0]*x[1],diagnostics.degs(net).items()))/2.+sum(map(lambda x:len(edgetoindex[x[0],x[1]])-1,multiedges))==sum(map(lambda x:x[0]*x[1],degs.items()))/2.
-
-    #for s in range(len(stubs)/2):
-    #    n1,n2=stubs[2*s],stubs[2*s+1]
-    #    assert net[n1,n2]==1,str(2*s)
-
-    for n1,n2 in multiedges:
-        for dummy in range(int(math.floor(len(edgetoindex[(n1,n2)])/2.))):
-            repeat=True
-            while repeat:
-                #select two edges at random
-                e1i,e2i=map(lambda x:2*x,random.sample(xrange(int(len(stubs)/2)),2))
-                c=[n1,n2,stubs[e1i],stubs[e1i+1],stubs[e2i],stubs[e2i+1]]
-                n3,n4=sorted([c[2],c[3]])
-                n5,n6=sorted([c[4],c[5]])
-                if len(set(c))==len(c):
-                    if (n3,n4) not in multiedges and (n5,n6) not in multiedges:
-                        if net[n1,n3]==0 and net[n2,n4]==0 and net[n1,n5]==0 and net[n2,n6]==0:
-                            if len(edgetoindex[n1,n2])==2:
-                                net[n1,n2]=0
-                            assert net[n3,n4]==1
-                            assert net[n5,n6]==1
-                            net[n3,n4]=0
-                            net[n5,n6]=0
-                            net[n1,n3]=1
-                            net[n2,n4]=1
-                            net[n1,n5]=1
-                            net[n2,n6]=1
-                            si1,si2=sorted([edgetoindex[n1,n2].pop(),edgetoindex[n1,n2].pop()])
-                            stubs[si1],stubs[si1+1]=sorted([n1,n3])
-                            stubs[si2],stubs[si2+1]=sorted([n2,n4]) #stubs[si1],stubs[si1+1]=sorted([n2,n4])
-                            stubs[e1i],stubs[e1i+1]=sorted([n1,n5])
-                            stubs[e2i],stubs[e2i+1]=sorted([n2,n6])
-                            repeat=False
+    #for s in range(len(stubs)//2):
+    #    assert _pair_key(stubs[2*s],stubs[2*s+1]) in edges,str(2*s)
 
+    net.add_edges_from((labels[key>>32],labels[key&0xffffffff]) for key in edges)
 
 
 def single_layer_er(net,nodes,p=None,edges=None):
@@ -178,27 +307,38 @@ def single_layer_er(net,nodes,p=None,edges=None):
     for node in nodes:
         net.add_node(node)
 
+    edgelist=[]
     if p!=None:        
         if p==1.0:
-            for node1 in nodes:
-                for node2 in nodes:
-                    if node1!=node2:
-                        net[node1,node2]=1
-        else:
-            v,w=1,-1
-            while (v < n):
-                r=random.random()
-                w=w+1+int(math.floor(math.log(1-r)/math.log(1-p)))
-                while ((w >= v) and (v < n)):
-                    w = w-v
-                    v = v+1
-                if (v < n):
-                    net[nodes[v],nodes[w]]=1
+            edgelist=itertools.permutations(nodes,2) if net.directed else itertools.combinations(nodes,2)
+        elif p>0:
+            rng=_numpy_rng() if n>=100 else None #the scalar loop is faster for tiny networks
+            if rng!=None:
+                for indices in _random_indices(rng,n*(n-1)//2,p):
+                    vs,ws=_triangle_index_to_pair(indices)
+                    edgelist.extend((nodes[v],nodes[w]) for v,w in zip(vs.tolist(),ws.tolist()))
+            else:
+                v,w=1,-1
+                while (v < n):
+                    r=random.random()
+                    w=w+1+int(math.floor(math.log(1-r)/math.log(1-p)))
+                    while ((w >= v) and (v < n)):
+                        w = w-v
+                        v = v+1
+                    if (v < n):
+                        edgelist.append((nodes[v],nodes[w]))
     else:
-        for edge_index in random.sample(xrange(int((n*(n-1))/2)),edges):
-            v=int(1+math.floor(-0.5+math.sqrt(0.25+2*edge_index)))
-            w=edge_index-int((v*(v-1))/2)
-            net[nodes[v],nodes[w]]=1
+        rng=_numpy_rng() if n>=100 else None
+        if rng!=None:
+            vs,ws=_triangle_index_to_pair(rng.choice(n*(n-1)//2,size=edges,replace=False))
+            edgelist=[(nodes[v],nodes[w]) for v,w in zip(vs.tolist(),ws.tolist())]
+        else:
+            for edge_index in random.sample(xrange(n*(n-1)//2),edges):
+                v=int(1+math.floor(-0.5+math.sqrt(0.25+2*edge_index)))
+                w=edge_index-v*(v-1)//2
+                edgelist.append((nodes[v],nodes[w]))
+
+    net.add_edges_from(edgelist)
 
 def conf(degs,degstype="distribution",couplings=("categorical",1.0)):
     """Independent configuration model for multiplex networks.
@@ -279,8 +419,7 @@ def conf(degs,degstype="distribution",couplings=("categorical",1.0)):
 
         net=MultiplexNetwork(couplings=[couplings],fullyInterconnected=nodeAligned)
         if namedlayers:
-            #layers=degs.iteritems()
-            layers = ((node, degs[node]) for node in degs )
+            layers=degs.items()
         else:
             layers=enumerate(degs)
         for l,ldegs in layers:
@@ -333,18 +472,18 @@ def er(n,p=None,edges=None):
         net=MultiplexNetwork(couplings=[('categorical',1.0)],fullyInterconnected=fic)
         if not hasattr(n,'__iter__'):
             if p!=None:
-                nodes=list(map(lambda x:xrange(n),p))
-                layers=xrange(len(p))
+                nodes=[range(n) for x in p]
+                layers=range(len(p))
             else:
-                nodes=list(map(lambda x:xrange(n),edges))
-                layers=xrange(len(edges))
+                nodes=[range(n) for x in edges]
+                layers=range(len(edges))
         else:
             nodes=n
-            layers=xrange(len(n))
+            layers=range(len(n))
             if p!=None and (not hasattr(p,'__iter__')):
-                p=list(map(lambda x:p,layers))
+                p=[p]*len(layers)
             if edges!=None and (not hasattr(edges,'__iter__')):
-                edges=list(map(lambda x:edges,layers))
+                edges=[edges]*len(layers)
                 
 
     # Fill in the edges
@@ -416,24 +555,15 @@ def full(nodes,layers,couplings=('categorical',1.0)):
     """
     if layers==None:
         n=MultilayerNetwork(aspects=0)
-        for node1 in range(nodes):
-            for node2 in range(nodes):
-                if node1!=node2:
-                    n[node1,node2]=1
-    elif not hasattr(layers,'__iter__'): #is not sequence
-        n=MultiplexNetwork(couplings=[couplings])
-        for layer in range(layers):
-            for node1 in range(nodes):
-                for node2 in range(nodes):
-                    if node1!=node2:
-                        n[node1,node2,layer,layer]=1
-    else: #it's a sequence
+        n.add_edges_from(itertools.combinations(range(nodes),2))
+    else:
+        if not hasattr(layers,'__iter__'): #is not sequence
+            layers=range(layers)
         n=MultiplexNetwork(couplings=[couplings])
-        for layer in layers:
-            for node1 in range(nodes):
-                for node2 in range(nodes):
-                    if node1!=node2:
-                        n[node1,node2,layer,layer]=1
+        if nodes>1: #without edges the layers are not created
+            for layer in layers:
+                n.add_layer(layer)
+                n.A[layer].add_edges_from(itertools.combinations(range(nodes),2))
 
     return n
 
@@ -459,12 +589,8 @@ def full_multilayer(nodes,layers):
         layers=range(layers)
 
     n=MultilayerNetwork(aspects=1)
-    for layer1 in layers:
-        for layer2 in layers:
-            for node1 in range(nodes):
-                for node2 in range(nodes):
-                    if node1!=node2 or layer1!=layer2:
-                        n[node1,node2,layer1,layer2]=1
+    nodelayers=itertools.product(range(nodes),layers)
+    n.add_edges_from((nl1[0],nl2[0],nl1[1],nl2[1]) for nl1,nl2 in itertools.combinations(nodelayers,2))
     return n
 
 def er_multilayer(nodes,layers,p,randomWeights=False):
@@ -493,18 +619,38 @@ def er_multilayer(nodes,layers,p,randomWeights=False):
     if not hasattr(layers,'__iter__'): #is not sequence
         layers=range(layers)
 
-    n=MultilayerNetwork(aspects=1)
-    for layer1 in layers:
-        for layer2 in layers:
-            for node1 in range(nodes):
-                for node2 in range(node1+1,nodes):
-                    if node1!=node2 or layer1!=layer2:
+    def edges():
+        rng=_numpy_rng() if nodes>=100 else None #the scalar loop is faster for tiny networks
+        if rng!=None:
+            if p<=0:
+                return
+            layerlist=list(layers)
+            npairs=nodes*(nodes-1)//2
+            #the flattened index runs over the node pairs of each layer pair in turn
+            for indices in _random_indices(rng,len(layerlist)**2*npairs,p):
+                blockindices,pairindices=divmod(indices,npairs)
+                node2s,node1s=_triangle_index_to_pair(pairindices)
+                layer1s,layer2s=divmod(blockindices,len(layerlist))
+                if randomWeights:
+                    weights=rng.random(len(pairindices)).tolist()
+                else:
+                    weights=itertools.repeat(1)
+                for node1,node2,l1,l2,w in zip(node1s.tolist(),node2s.tolist(),layer1s.tolist(),layer2s.tolist(),weights):
+                    yield (node1,node2,layerlist[l1],layerlist[l2],w)
+            return
+
+        for layer1 in layers:
+            for layer2 in layers:
+                for node1 in range(nodes):
+                    for node2 in range(node1+1,nodes):
                         if random.random()<p:
                             if randomWeights:
-                                n[node1,node2,layer1,layer2]=random.random()
+                                yield (node1,node2,layer1,layer2,random.random())
                             else:
-                                n[node1,node2,layer1,layer2]=1
+                                yield (node1,node2,layer1,layer2,1)
 
+    n=MultilayerNetwork(aspects=1)
+    n.add_edges_from(edges(),weight=None)
     return n
 
 
@@ -579,8 +725,8 @@ def conf_overlaps(ol_degs, couplings=None):
     
         random.shuffle(stubs)
         
-        for s in range(int(len(stubs)/2)):
-            node1,node2=sorted([stubs[2*s],stubs[2*s+1]])
+        for s in range(len(stubs)//2):
+            node1,node2=_ordered_pair(stubs[2*s],stubs[2*s+1])
     
             edgetoindex[(node1,node2)]=edgetoindex.get((node1,node2),[])+[2*s]
     
@@ -599,24 +745,25 @@ def conf_overlaps(ol_degs, couplings=None):
                 repeat=True
                 while repeat:
                     #select two edges at random
-                    e1i,e2i=map(lambda x:2*x,random.sample(xrange(int(len(stubs)/2)),2))
+                    i1,i2=_two_distinct(len(stubs)//2)
+                    e1i,e2i=2*i1,2*i2
                     c=[node,stubs[e1i],stubs[e1i+1],stubs[e2i],stubs[e2i+1]]
-                    n2,n3=sorted([c[1],c[2]])
-                    n4,n5=sorted([c[3],c[4]])
+                    n2,n3=_ordered_pair(c[1],c[2])
+                    n4,n5=_ordered_pair(c[3],c[4])
                     if len(set(c))==len(c):
                         if (n2,n3) not in multiedges and (n4,n5) not in multiedges and (n2,n3) not in takenedges and (n4,n5) not in takenedges:
-                            e1 = tuple(sorted([node, n2]))
-                            e2 = tuple(sorted([node, n4]))
-                            e3 = tuple(sorted([n3, n5]))
+                            e1 = _ordered_pair(node,n2)
+                            e2 = _ordered_pair(node,n4)
+                            e3 = _ordered_pair(n3,n5)
                             if e1 not in used_edges and e2 not in used_edges and e3 not in used_edges:
                                 net_temp[n2,n3]=0
                                 net_temp[n4,n5]=0
                                 net_temp[node,n2]=1
                                 net_temp[node,n4]=1
                                 net_temp[n3,n5]=1
-                                stubs[si],stubs[si+1]=sorted([n3,n5])
-                                stubs[e1i],stubs[e1i+1]=sorted([node,n2])
-                                stubs[e2i],stubs[e2i+1]=sorted([node,n4])
+                                stubs[si],stubs[si+1]=_ordered_pair(n3,n5)
+                                stubs[e1i],stubs[e1i+1]=_ordered_pair(node,n2)
+                                stubs[e2i],stubs[e2i+1]=_ordered_pair(node,n4)
                                 repeat=False
                                 
                                 used_edges.remove((n2,n3))
@@ -626,20 +773,21 @@ def conf_overlaps(ol_degs, couplings=None):
                                 used_edges.add(e3)
                                 
         for n1,n2 in multiedges:
-            for dummy in range(int(math.floor(len(edgetoindex[(n1,n2)])/2.))):
+            for dummy in range(len(edgetoindex[(n1,n2)])//2):
                 repeat=True
                 while repeat:
                     #select two edges at random
-                    e1i,e2i=map(lambda x:2*x,random.sample(xrange(int(len(stubs)/2)),2))
+                    i1,i2=_two_distinct(len(stubs)//2)
+                    e1i,e2i=2*i1,2*i2
                     c=[n1,n2,stubs[e1i],stubs[e1i+1],stubs[e2i],stubs[e2i+1]]
-                    n3,n4=sorted([c[2],c[3]])
-                    n5,n6=sorted([c[4],c[5]])
+                    n3,n4=_ordered_pair(c[2],c[3])
+                    n5,n6=_ordered_pair(c[4],c[5])
                     if len(set(c))==len(c):
                         if (n3,n4) not in multiedges and (n5,n6) not in multiedges and (n3,n4) not in takenedges and (n5,n6) not in takenedges:
-                            e1 = tuple(sorted([n1,n3]))
-                            e2 = tuple(sorted([n2,n4]))
-                            e3 = tuple(sorted([n1,n5]))
-                            e4 = tuple(sorted([n2,n6]))
+                            e1 = _ordered_pair(n1,n3)
+                            e2 = _ordered_pair(n2,n4)
+                            e3 = _ordered_pair(n1,n5)
+                            e4 = _ordered_pair(n2,n6)
                             if e1 not in used_edges and e2 not in used_edges and e3 not in used_edges and e4 not in used_edges: #net[n1,n3]==0 and net[n2,n4]==0 and net[n1,n5]==0 and net[n2,n6]==0:
                                 if len(edgetoindex[n1,n2])==2:
                                     net_temp[n1,n2]=0
@@ -650,11 +798,11 @@ def conf_overlaps(ol_degs, couplings=None):
                                 net_temp[n2,n4]=1
                                 net_temp[n1,n5]=1
                                 net_temp[n2,n6]=1
-                                si1,si2=sorted([edgetoindex[n1,n2].pop(),edgetoindex[n1,n2].pop()])
-                                stubs[si1],stubs[si1+1]=sorted([n1,n3])
-                                stubs[si2],stubs[si2+1]=sorted([n2,n4])#stubs[si1],stubs[si1+1]=sorted([n2,n4])
-                                stubs[e1i],stubs[e1i+1]=sorted([n1,n5])
-                                stubs[e2i],stubs[e2i+1]=sorted([n2,n6])
+                                si1,si2=_ordered_pair(edgetoindex[n1,n2].pop(),edgetoindex[n1,n2].pop())
+                                stubs[si1],stubs[si1+1]=_ordered_pair(n1,n3)
+                                stubs[si2],stubs[si2+1]=_ordered_pair(n2,n4)#stubs[si1],stubs[si1+1]=_ordered_pair(n2,n4)
+                                stubs[e1i],stubs[e1i+1]=_ordered_pair(n1,n5)
+                                stubs[e2i],stubs[e2i+1]=_ordered_pair(n2,n6)
                                 repeat=False
                                 
                                 used_edges.remove((n3,n4))
@@ -669,15 +817,16 @@ def conf_overlaps(ol_degs, couplings=None):
                 repeat=True
                 while repeat:
                     #select two edges at random
-                    e1i,e2i=map(lambda x:2*x,random.sample(xrange(int(len(stubs)/2)),2))
+                    i1,i2=_two_distinct(len(stubs)//2)
+                    e1i,e2i=2*i1,2*i2
                     c=[n1,n2,stubs[e1i],stubs[e1i+1],stubs[e2i],stubs[e2i+1]]
-                    n3,n4=sorted([c[2],c[3]])
-                    n5,n6=sorted([c[4],c[5]])
+                    n3,n4=_ordered_pair(c[2],c[3])
+                    n5,n6=_ordered_pair(c[4],c[5])
                     if len(set(c))==len(c):
                         if (n3,n4) not in takenedges and (n5,n6) not in takenedges:
-                            e1 = tuple(sorted([n1,n3]))
-                            e2 = tuple(sorted([n2,n5]))
-                            e3 = tuple(sorted([n4,n6]))
+                            e1 = _ordered_pair(n1,n3)
+                            e2 = _ordered_pair(n2,n5)
+                            e3 = _ordered_pair(n4,n6)
                             if e1 not in used_edges and e2 not in used_edges and e3 not in used_edges:
                                 assert net_temp[n3,n4]==1
                                 assert net_temp[n5,n6]==1
@@ -687,9 +836,9 @@ def conf_overlaps(ol_degs, couplings=None):
                                 net_temp[n2,n5]=1
                                 net_temp[n4,n6]=1
                                 
-                                stubs[si1],stubs[si1+1]=sorted([n1,n3])
-                                stubs[e1i],stubs[e1i+1]=sorted([n2,n5])
-                                stubs[e2i],stubs[e2i+1]=sorted([n4,n6])
+                                stubs[si1],stubs[si1+1]=_ordered_pair(n1,n3)
+                                stubs[e1i],stubs[e1i+1]=_ordered_pair(n2,n5)
+                                stubs[e2i],stubs[e2i+1]=_ordered_pair(n4,n6)
                                 repeat=False
                                 
                                 used_edges.remove((n3,n4))
@@ -756,9 +905,9 @@ def er_overlaps_match_aggregated(n, edges, ps, couplings=None):
                 e_left[layer] = e_left.get(layer, edges) - m
             i = 0
             while i < (k * m):
-                edge_index = random.choice(xrange(int((n*(n-1))/2)))
+                edge_index = random.randrange(n*(n-1)//2)
                 v=int(1+math.floor(-0.5+math.sqrt(0.25+2*edge_index)))
-                w=edge_index-int((v*(v-1))/2)
+                w=edge_index-v*(v-1)//2
                 edge = (w, v)
                 if edge not in used_edges:
                     used_edges.add(edge)
@@ -770,9 +919,9 @@ def er_overlaps_match_aggregated(n, edges, ps, couplings=None):
         m = e_left[layer]
         i = 0
         while i < m:
-            edge_index = random.choice(xrange(int((n*(n-1))/2)))
+            edge_index = random.randrange(n*(n-1)//2)
             v=int(1+math.floor(-0.5+math.sqrt(0.25+2*edge_index)))
-            w=edge_index-int((v*(v-1))/2)
+            w=edge_index-v*(v-1)//2
             edge = (w, v)
             if edge not in used_edges:
                 used_edges.add(edge)
@@ -532,6 +532,80 @@ class MultilayerNetwork(object):
 
         self._set_link(link,val)
 
+    def add_edges_from(self,edges,weight=1):
+        """Adds edges from an iterable to the network.
+
+        This is equivalent to setting net[edge]=weight for each edge, but
+        avoids the overhead of the indexing interface for each edge.
+
+        Parameters
+        ----------
+        edges : iterable of tuples
+           The edges given as index tuples accepted by __setitem__, i.e.
+           (i,j,s_1,r_1, ... ,s_d,r_d) or (i,j,s_1, ... ,s_d).
+        weight : object
+           The weight of the edges. If None, the last element of each tuple
+           is the weight of that edge. This is the format of the tuples in
+           the edges property.
+
+        Examples
+        --------
+        >>> net.add_edges_from([(1,2,'a','a'),(1,2,'a','b')])
+        >>> net.add_edges_from(othernet.edges,weight=None)
+        """
+        d=self.aspects+1
+        slices=self.slices
+        noEdge=self.noEdge
+        fullyInterconnected=self.fullyInterconnected
+        #the set of (elementary) layers for each index of a link
+        linkslices=[slices[i//2] for i in range(2*d)]
+        contains=set.__contains__
+        #undirected multilayer networks can be written directly to the graph
+        direct=not self.directed and not isinstance(self,MultiplexNetwork)
+        if direct:
+            mnet=self._net
+
+        for edge in edges:
+            if weight is None:
+                edge,val=edge[:-1],edge[-1]
+            else:
+                val=weight
+            if len(edge)==2*d:
+                link=edge
+            elif len(edge)==d+1:
+                link=self._short_link_to_link(edge)
+            else:
+                raise KeyError("Invalid number of indices.")
+
+            if fullyInterconnected:
+                if not all(map(contains,linkslices,link)):
+                    for i in range(2*d):
+                        if link[i] not in slices[i//2]:
+                            self.add_layer(link[i],i//2)
+            else:
+                if self.aspects==1:
+                    self.add_node(link[0],layer=link[2])
+                    self.add_node(link[1],layer=link[3])
+                else:
+                    n1,n2=self._link_to_nodes(link)
+                    self.add_node(n1[0],layer=n1[1:])
+                    self.add_node(n2[0],layer=n2[1:])
+                for i in range(2,2*d):
+                    if link[i] not in slices[i//2]:
+                        self.add_layer(link[i],i//2)
+
+            if direct and val!=noEdge:
+                node1,node2=(link[0],)+link[2::2],(link[1],)+link[3::2]
+                if node1 in mnet:
+                    mnet[node1][node2]=val
+                else:
+                    mnet[node1]={node2:val}
+                if node2 in mnet:
+                    mnet[node2][node1]=val
+                else:
+                    mnet[node2]={node1:val}
+            else:
+                self._set_link(link,val)
 
 
     def get_layers(self,aspect=1):
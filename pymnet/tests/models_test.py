@@ -26,6 +26,49 @@ class TestModels(unittest.TestCase):
         models.single_layer_er(net2,range(10),p=None,edges=30)
         self.assertEqual(len(net2.edges),30)
 
+        net3=net.MultilayerNetwork(aspects=0)
+        models.single_layer_er(net3,range(1000),p=None,edges=5000)
+        self.assertEqual(len(net3.edges),5000)
+        self.assertEqual(len(net3),1000)
+
+    def test_monoplex_erdosrenyi_p(self):
+        for size,p in [(10,0.1),(1000,0.1),(1000,0.5)]:
+            n=net.MultilayerNetwork(aspects=0)
+            models.single_layer_er(n,range(size),p=p)
+            self.assertEqual(len(n),size)
+            for node in n:
+                self.assertEqual(n[node,node],0)
+            #edge count within 5 standard deviations of the mean
+            m=p*size*(size-1)/2.
+            self.assertTrue(abs(len(n.edges)-m)<=5*math.sqrt(m*(1-p)))
+
+        for size in [10,1000]:
+            n=net.MultilayerNetwork(aspects=0)
+            models.single_layer_er(n,range(size),p=0)
+            self.assertEqual(len(n),size)
+            self.assertEqual(len(n.edges),0)
+
+        for directed in [False,True]:
+            n=net.MultilayerNetwork(aspects=0,directed=directed)
+            models.single_layer_er(n,range(5),p=1.0)
+            self.assertEqual(len(n.edges),20 if directed else 10)
+
+    def test_full(self):
+        n=models.full(5,None)
+        self.assertEqual(len(n.edges),10)
+
+        n=models.full(5,['a','b'])
+        self.assertEqual(set(n.get_layers()),set(['a','b']))
+        self.assertEqual(len(n.A['a'].edges),10)
+        self.assertEqual(len(n.A['b'].edges),10)
+
+        #no edges and therefore no layers
+        self.assertEqual(len(models.full(1,3).get_layers()),0)
+        self.assertEqual(len(models.full(0,['a','b']).get_layers()),0)
+
+        n=models.full_multilayer(3,2)
+        self.assertEqual(len(n.edges),15)
+
     def test_multiplex_erdosrenyi(self):
         net=models.er(10,0.5)
         net2=models.er(10,[0.4,0.6])
@@ -51,6 +94,21 @@ class TestModels(unittest.TestCase):
         self.assertEqual(set(net5.A[1]),set(range(5,15)))
 
 
+    def test_multilayer_erdosrenyi(self):
+        for size,p in [(10,0.5),(200,0.05),(200,0.5)]:
+            n=models.er_multilayer(size,['a','b'],p)
+            self.assertEqual(set(n.slices[1]),set(['a','b']))
+            for edge in n.edges:
+                self.assertNotEqual(edge[0],edge[1])
+                self.assertEqual(edge[4],1)
+            #edge count within 5 standard deviations of the mean
+            m=p*4*size*(size-1)/2.
+            self.assertTrue(abs(len(n.edges)-m)<=5*math.sqrt(m*(1-p)))
+
+        n=models.er_multilayer(200,3,0.1,randomWeights=True)
+        for edge in n.edges:
+            self.assertTrue(0<=edge[4]<1)
+
     def test_monoplex_configuration_model(self):
         net=models.conf({5:1000}) #maxdeg << sqrt(number of nodes)
         self.assertEqual(diagnostics.degs(net),{5:1000})
@@ -75,6 +133,9 @@ class TestModels(unittest.TestCase):
         for i in range(99):
             self.assertEqual(net[i].deg(),int(math.sqrt(i)))
 
+        #a single self-edge cannot be rewired
+        self.assertRaises(ValueError,lambda:models.conf({'a':2,'b':0},degstype="nodes"))
+
     def test_multiplex_configuration_model(self):
         net=models.conf([{50:100},{50:100}])
         self.assertEqual(diagnostics.multiplex_degs(net),{0:{50:100},1:{50:100}})
@@ -94,7 +155,10 @@ class TestModels(unittest.TestCase):
 def test_models():
     suite = unittest.TestSuite()    
     suite.addTest(TestModels("test_monoplex_erdosrenyi"))
+    suite.addTest(TestModels("test_monoplex_erdosrenyi_p"))
+    suite.addTest(TestModels("test_full"))
     suite.addTest(TestModels("test_multiplex_erdosrenyi"))
+    suite.addTest(TestModels("test_multilayer_erdosrenyi"))
     suite.addTest(TestModels("test_monoplex_configuration_model"))
     suite.addTest(TestModels("test_multiplex_configuration_model"))
 
@@ -891,8 +891,31 @@ class TestNet(unittest.TestCase):
 
         self.assertEqual(len(mnet.edges),len(list(mnet.edges))) #this should always be true
         self.assertEqual(len(list(mnet.edges)),3) #self-edges only once in the edge list
-        
 
+    def test_add_edges_from(self):
+        """Testing that adding edges in bulk is equivalent to adding them one by one.
+        """
+        edges=[(1,2,'a','a'),(2,3,'a','b'),(1,1,'a','b'),(3,3,'b','b'),(4,1,'b','a')]
+        for netargs in [{},{"directed":True},{"fullyInterconnected":False},{"noEdge":-1}]:
+            n1=net.MultilayerNetwork(aspects=1,**netargs)
+            n2=net.MultilayerNetwork(aspects=1,**netargs)
+            for edge in edges:
+                n1[edge]=2
+            n2.add_edges_from(edges,weight=2)
+            self.assertEqual(n1,n2)
+            n3=net.MultilayerNetwork(aspects=1,**netargs)
+            n3.add_edges_from(n1.edges,weight=None)
+            self.assertEqual(n1,n3)
+
+        mplex1=net.MultiplexNetwork(couplings="categorical")
+        mplex2=net.MultiplexNetwork(couplings="categorical")
+        for edge in [(1,2,'a'),(2,3,'b'),(1,2,'b')]:
+            mplex1[edge]=1
+        mplex2.add_edges_from([(1,2,'a'),(2,3,'b','b'),(1,2,'b')])
+        self.assertEqual(mplex1,mplex2)
+
+        self.assertRaises(KeyError,lambda:mplex2.add_edges_from([(1,2)]))
+        
 
 def test_net():
     suite = unittest.TestSuite()    
@@ -918,6 +941,7 @@ def test_net():
     suite.addTest(TestNet("test_mlayer_2dim_nonglobalnodes"))
     suite.addTest(TestNet("test_mplex_adding_intralayer_nets"))
     suite.addTest(TestNet("test_selfedges"))
+    suite.addTest(TestNet("test_add_edges_from"))
         
     return unittest.TextTestRunner().run(suite).wasSuccessful()
 
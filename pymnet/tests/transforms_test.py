@@ -88,6 +88,44 @@ class TestTransforms(unittest.TestCase):
         self.assertEqual(an[3,4],1)
         self.assertEqual(an[2,4],1)
 
+    def test_overlay_network(self):
+        on=transforms.overlay_network(self.mplex_simple)
+        self.assertEqual(set(on),set([1,2,3,4]))
+        self.assertEqual(len(on.edges),6)
+        self.assertEqual(on[1,2],3)
+        self.assertEqual(on[1,4],2)
+        self.assertEqual(on[2,4],1)
+
+        on=transforms.overlay_network(self.mlayer_example_1d)
+        self.assertEqual(len(on.edges),5)
+        self.assertEqual(on[1,2],1)
+        self.assertEqual(on[1,4],1)
+        self.assertEqual(on[3,4],1)
+        self.assertEqual(on[1,1],0)
+
+        n=net.MultiplexNetwork([('categorical',1.0)],directed=True)
+        n[1,2,'a']=1
+        n[2,1,'a']=2
+        n[1,2,'b']=0.5
+        n[2,3,'b']=1
+        on=transforms.overlay_network(n)
+        self.assertFalse(on.directed)
+        self.assertEqual(on[1,2],3.5)
+        self.assertEqual(on[3,2],1)
+
+        #weights are summed without overflow and integers stay integers
+        n=net.MultiplexNetwork([('categorical',1.0)])
+        n[1,2,'a']=2**62
+        n[1,2,'b']=2**62
+        n[2,3,'a']=1
+        n[2,3,'b']=1
+        n[3,4,'a']=0.5
+        on=transforms.overlay_network(n)
+        self.assertEqual(on[1,2],2**63)
+        self.assertEqual(on[2,3],2)
+        self.assertTrue(isinstance(on[2,3],int))
+        self.assertEqual(on[3,4],0.5)
+
     def test_aggregate_2dim_mplex(self):
         n=net.MultiplexNetwork([('categorical',1.0),('categorical',1.0)])
         n[1,2,'a','x']=3
@@ -352,6 +390,7 @@ def test_transforms():
     suite.addTest(TestTransforms("test_aggregate_2dim_mlayer_nonglobal_nodes"))
     suite.addTest(TestTransforms("test_aggregate_1dim_mlayer_nonglobal_nodes"))
     suite.addTest(TestTransforms("test_aggregate_2dim_mlayer_interlayeredges"))
+    suite.addTest(TestTransforms("test_overlay_network"))
     suite.addTest(TestTransforms("test_subnet_mlayer_example"))
     suite.addTest(TestTransforms("test_subnet_mplex_simple"))
     suite.addTest(TestTransforms("test_subnet_mplex_to_mlayer"))
@@ -2,6 +2,7 @@
 """
 import math
 import itertools
+import operator
 import random
 from functools import reduce
 
@@ -76,12 +77,27 @@ def aggregate(net,aspects,newNet=None,selfEdges=False):
     
     #Add edges
     edgeIndices=list(filter(lambda x:math.floor(x/2) not in aspects,range(2*(net.aspects+1))))
-    for edge in net.edges:
-        newEdge=[]
-        for index in edgeIndices:
-            newEdge.append(edge[index])
+    if isinstance(net,netmodule.MultiplexNetwork) and newNet.aspects==0 and not selfEdges:
+        #coupling edges would only produce self-edges, so the intra-layer networks are enough
+        edges=(edge for layer in net.iter_layers() for edge in net.A[layer].edges)
+        edgeIndices=[0,1]
+    else:
+        edges=net.edges
+    project=operator.itemgetter(*edgeIndices)
+    #maps an edge to the same edge in reversed direction
+    reverse=operator.itemgetter(*[i^1 for i in range(len(edgeIndices))])
+    #the weights are summed here and written to newNet once
+    weights={}
+    for edge in edges:
+        newEdge=project(edge)
         if selfEdges or not newEdge[0::2]==newEdge[1::2]:
-            newNet[tuple(newEdge)]=newNet[tuple(newEdge)]+edge[-1]
+            if newEdge not in weights:
+                if not newNet.directed and reverse(newEdge) in weights:
+                    newEdge=reverse(newEdge)
+                else:
+                    weights[newEdge]=newNet[newEdge]
+            weights[newEdge]=weights[newEdge]+edge[-1]
+    newNet.add_edges_from((newEdge+(w,) for newEdge,w in weights.items()),weight=None)
 
     #Add node-layer tuples (if not node-aligned)
     if not net.fullyInterconnected and newNet.aspects>0:
@@ -108,13 +124,43 @@ def overlay_network(net):
     net : MultiplexNetwork
        A new instance of multiplex network which is produced.
     """
+    import numpy
     assert net.aspects==1
     newnet=netmodule.MultilayerNetwork()
-    for layer in net.slices[1]:
-        for node1 in net.slices[0]:
-            for node2 in net.slices[0]:
-                if net.directed or node1>node2:
-                    newnet[node1,node2]=newnet[node1,node2]+net[node1,node2,layer,layer]
+    nodes=list(net.slices[0])
+    for node in nodes:
+        newnet.add_node(node)
+    index=dict((node,i) for i,node in enumerate(nodes))
+
+    #Stream the intra-layer edges as (node1,node2,weight) triples
+    if isinstance(net,netmodule.MultiplexNetwork):
+        edges=(edge for layer in net.iter_layers() for edge in net.A[layer].edges)
+    else:
+        edges=((edge[0],edge[1],edge[4]) for edge in net.edges if edge[2]==edge[3])
+    #Self-edges only contribute to the overlay of directed networks
+    directed=net.directed
+    rows,cols,weights=[],[],[]
+    for node1,node2,w in edges:
+        i,j=index[node1],index[node2]
+        if directed or i!=j:
+            rows.append(i)
+            cols.append(j)
+            weights.append(w)
+    if len(weights)==0:
+        return newnet
+
+    #Group the edges by the packed key of the undirected node pair and sum each group.
+    #The weights are summed as Python objects so that their types and precision are kept.
+    rows,cols=numpy.array(rows,dtype=numpy.int64),numpy.array(cols,dtype=numpy.int64)
+    keys=numpy.minimum(rows,cols)*len(nodes)+numpy.maximum(rows,cols)
+    order=numpy.argsort(keys,kind="mergesort")
+    keys=keys[order]
+    starts=numpy.flatnonzero(numpy.concatenate(([True],keys[1:]!=keys[:-1])))
+    sums=numpy.add.reduceat(numpy.array(weights,dtype=object)[order],starts)
+    keys=keys[starts]
+    overlay=[(nodes[i],nodes[j],w) for i,j,w in zip((keys//len(nodes)).tolist(),(keys%len(nodes)).tolist(),sums.tolist())]
+
+    newnet.add_edges_from((edge for edge in overlay if edge[2]!=newnet.noEdge),weight=None)
     return newnet
 
 def subnet(net,nodes,*layers,**kwargs):
@@ -202,36 +248,58 @@ def subnet(net,nodes,*layers,**kwargs):
 
 
     #copy the links
-    if not nolinks:        
-        if isinstance(net,netmodule.MultiplexNetwork) and isinstance(newNet,netmodule.MultiplexNetwork):
-            #Go through all the combinations of new layers
-            for layer in itertools.product(*nodelayers[1:]):
-                layer=layer[0] if net.aspects==1 else layer
-                subnet(net.A[layer],nodelayers[0],newNet=newNet.A[layer],nolinks=nolinks)
-        elif (isinstance(net,netmodule.MultilayerNetwork) and (isinstance(newNet,netmodule.MultilayerNetwork) and not isinstance(newNet,netmodule.MultiplexNetwork))) or (isinstance(net,netmodule.MultiplexNetwork) and (isinstance(newNet,netmodule.MultilayerNetwork) and not isinstance(newNet,netmodule.MultiplexNetwork))):
-            for nl1 in itertools.product(*nodelayers):
-                nl1 = nl1[0] if net.aspects==0 else nl1
-                if net[nl1].deg()>=totalNodeLayers:
-                    for nl2 in itertools.product(*nodelayers):
-                        nl2 = nl2[0] if net.aspects==0 else nl2
-                        if net[nl1][nl2]!=net.noEdge:
-                            newNet[nl1][nl2]=net[nl1][nl2]
-                else:
-                    if net.aspects==0:
-                        for nl2 in net[nl1]:
-                            if nl2 in nodelayers[0]:
-                                newNet[nl1][nl2]=net[nl1][nl2]
-                    else:
-                        for nl2 in net[nl1]:
-                            if reduce(lambda x,y:x and y, (e in nodelayers[a] for a,e in enumerate(nl2))):
-                                newNet[nl1][nl2]=net[nl1][nl2]
-        elif isinstance(net,netmodule.MultilayerNetwork) and isinstance(newNet,netmodule.MultiplexNetwork):
-            raise TypeError("Cannot copy multilayer network to multiplex network.")
+    if not nolinks:
+        if isinstance(newNet,netmodule.MultiplexNetwork):
+            if isinstance(net,netmodule.MultiplexNetwork):
+                _subnet_multiplex_links(net,newNet,nodelayers)
+            elif isinstance(net,netmodule.MultilayerNetwork):
+                raise TypeError("Cannot copy multilayer network to multiplex network.")
+            else:
+                raise TypeError("Invalid net types: "+str(type(net))+ " and "+ str(type(newNet)))
+        elif isinstance(net,netmodule.MultilayerNetwork) and isinstance(newNet,netmodule.MultilayerNetwork):
+            _subnet_multilayer_links(net,newNet,nodelayers,totalNodeLayers)
         else:
             raise TypeError("Invalid net types: "+str(type(net))+ " and "+ str(type(newNet)))
 
     return newNet
 
+def _subnet_multiplex_links(net,newNet,nodelayers):
+    """Copies the intra-layer links between the given nodes and layers of a
+    MultiplexNetwork to another MultiplexNetwork.
+    """
+    #Go through all the combinations of new layers
+    for layer in itertools.product(*nodelayers[1:]):
+        layer=layer[0] if net.aspects==1 else layer
+        subnet(net.A[layer],nodelayers[0],newNet=newNet.A[layer])
+
+def _subnet_multilayer_links(net,newNet,nodelayers,totalNodeLayers):
+    """Copies the links between the given node-layers of a network to a
+    MultilayerNetwork.
+    """
+    monoplex=net.aspects==0
+    noEdge=net.noEdge
+    net_get=net.__getitem__
+    new_get=newNet.__getitem__
+    nodes0=nodelayers[0]
+    for nl1 in itertools.product(*nodelayers):
+        nl1 = nl1[0] if monoplex else nl1
+        node1,newnode1=net_get(nl1),new_get(nl1)
+        if node1.deg()>=totalNodeLayers:
+            for nl2 in itertools.product(*nodelayers):
+                nl2 = nl2[0] if monoplex else nl2
+                w=node1[nl2]
+                if w!=noEdge:
+                    newnode1[nl2]=w
+        else:
+            if monoplex:
+                for nl2 in node1:
+                    if nl2 in nodes0:
+                        newnode1[nl2]=node1[nl2]
+            else:
+                for nl2 in node1:
+                    if all(e in nodelayers[a] for a,e in enumerate(nl2)):
+                        newnode1[nl2]=node1[nl2]
+
 
 def supra_adjacency_matrix(net,includeCouplings=True):
     """Returns the supra-adjacency matrix and a list of node-layer pairs.
@@ -269,15 +337,6 @@ def relabel(net,nodeNames=None,layerNames=None):
      newnet : type(net)
          The normalized network.
     """
-    def dget(d,e):
-        if e in d:
-            return d[e]
-        else:
-            return e
-
-    def layer_to_indexlayer(layer,layerNames):
-        return tuple([dget(layerNames[i],elayer) for i,elayer in enumerate(layer)])
-
     if nodeNames==None:
         nodeNames={}
 
@@ -291,51 +350,70 @@ def relabel(net,nodeNames=None,layerNames=None):
     for aspect in range(net.aspects):
         if len(layerNames)<aspect+1:
             layerNames.append({})
-     
+
+    return _relabeled_copy(net,nodeNames,layerNames)
+
+def _relabel_multilayer_edges(net,nodeNames,layerNames):
+    """Iterates over the edges of a MultilayerNetwork with the nodes and layers renamed.
+    """
+    names=nodeNames.get
+    layergets=[layerNames[aspect].get for aspect in range(net.aspects)]
+    for edge in net.edges:
+        newedge=[names(edge[0],edge[0]),names(edge[1],edge[1])]
+        for aspect,lget in enumerate(layergets):
+            l1,l2=edge[2+aspect*2],edge[2+aspect*2+1]
+            newedge.append(lget(l1,l1))
+            newedge.append(lget(l2,l2))
+        newedge.append(edge[-1])
+        yield tuple(newedge)
+
+def _relabel_multiplex_edges(net,nodeNames,layerNames):
+    """Iterates over the intra-layer edges of a MultiplexNetwork with the nodes and layers renamed.
+    """
+    names=nodeNames.get
+    for layer in net.iter_layers():
+        layertuple=(layer,) if net.aspects==1 else layer
+        newlayer=tuple([layerNames[a].get(elayer,elayer) for a,elayer in enumerate(layertuple)])
+        for node1,node2,w in net.A[layer].edges:
+            yield (names(node1,node1),names(node2,node2))+newlayer+(w,)
+
+def _relabeled_copy(net,nodeNames,layerNames):
+    """Returns a copy of the network with nodes and layers relabeled.
+
+    The nodeNames is a dict and layerNames a list of dicts, one for each aspect.
+    Nodes and layers missing from them keep their names. The edges are copied by
+    the implementation for the type of the network.
+    """
     if type(net)==netmodule.MultilayerNetwork:
         newNet=netmodule.MultilayerNetwork(aspects=net.aspects,
                                  noEdge=net.noEdge,
                                  directed=net.directed,
                                  fullyInterconnected=net.fullyInterconnected)
+        edges=_relabel_multilayer_edges(net,nodeNames,layerNames)
     elif type(net)==netmodule.MultiplexNetwork:
         newNet=netmodule.MultiplexNetwork(couplings=net.couplings,
                                 directed=net.directed,
                                 noEdge=net.noEdge,
                                 fullyInterconnected=net.fullyInterconnected)
+        edges=_relabel_multiplex_edges(net,nodeNames,layerNames)
     else:
         raise Exception("Invalid type of net",type(net))
 
+    names=nodeNames.get
     for node in net:
-        newNet.add_node(dget(nodeNames,node))
+        newNet.add_node(names(node,node))
     for aspect in range(net.aspects):
         for layer in net.slices[aspect+1]:
-            newNet.add_layer(dget(layerNames[aspect],layer),aspect=aspect+1) 
+            newNet.add_layer(layerNames[aspect].get(layer,layer),aspect=aspect+1) 
 
     if not net.fullyInterconnected:
         for nodelayer in net.iter_node_layers():
-            layer=layer_to_indexlayer(nodelayer[1:],layerNames)
+            layer=tuple([layerNames[a].get(elayer,elayer) for a,elayer in enumerate(nodelayer[1:])])
             if net.aspects==1:
                 layer=layer[0]
-            newNet.add_node(dget(nodeNames,nodelayer[0]),layer=layer)
-
-    if type(net)==netmodule.MultilayerNetwork:
-        for edge in net.edges:
-            newedge=[dget(nodeNames,edge[0]),dget(nodeNames,edge[1])]
-            for aspect in range(net.aspects):
-                newedge.append(dget(layerNames[aspect],edge[2+aspect*2]))
-                newedge.append(dget(layerNames[aspect],edge[2+aspect*2+1]))
-            newNet[tuple(newedge)]=edge[-1]
-    elif type(net)==netmodule.MultiplexNetwork:
-            for layer in net.iter_layers():
-                if net.aspects==1:
-                    layertuple=(layer,)
-                else:
-                    layertuple=layer
-                for node in net.A[layer]:
-                    for neigh in net.A[layer][node]:
-                        newNet[(dget(nodeNames,node),dget(nodeNames,neigh))+layer_to_indexlayer(layertuple,layerNames)]=net[(node,neigh)+layertuple]
+            newNet.add_node(names(nodelayer[0],nodelayer[0]),layer=layer)
 
-                            
+    newNet.add_edges_from(edges,weight=None)
     return newNet
 
 def normalize(net,nodesToIndices=None,layersToIndices=None,nodeStart=0,layerStart=0):
@@ -381,22 +459,18 @@ def normalize(net,nodesToIndices=None,layersToIndices=None,nodeStart=0,layerStar
         for i,layer in enumerate(sorted(net.slices[aspect+1])):
             layerNames[aspect][layer]=i+layerStart
 
-    newNet=relabel(net,nodeNames=nodeNames,layerNames=layerNames)
+    newNet=_relabeled_copy(net,nodeNames,layerNames)
 
     if nodesToIndices==False:
         indicesToNodes={}
-        #for node,index in nodeNames.iteritems():
-        for node in nodeNames:
-            index=nodeNames[node]    
+        for node,index in nodeNames.items():
             indicesToNodes[index]=node
         nodeNames=indicesToNodes
 
     if layersToIndices==False:
         for aspect in range(net.aspects):
             indicesToLayers={}
-            #for layer,index in layerNames[aspect].iteritems():
-            for layer in layerNames[aspect]:
-                index=layerNames[aspect][layer]
+            for layer,index in layerNames[aspect].items():
                 indicesToLayers[index]=layer
             layerNames[aspect]=indicesToLayers
 